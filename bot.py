@@ -1,7 +1,8 @@
 import asyncio
 import html
+from dataclasses import replace
 from datetime import datetime
-import re
+import string
 from typing import Optional
 
 from aiogram import Bot, Dispatcher, F, Router
@@ -49,65 +50,81 @@ PERIOD_LABELS = {
 
 LABEL_TO_PERIOD = {v: k for k, v in PERIOD_LABELS.items()}
 
+_USERNAME_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+
+_MAIN_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="Добавить напоминание")],
+        [KeyboardButton(text="Список напоминаний")],
+    ],
+    resize_keyboard=True,
+)
+
 
 def main_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="Добавить напоминание")],
-            [KeyboardButton(text="Список напоминаний")],
-        ],
-        resize_keyboard=True,
-    )
+    return _MAIN_KB
+
+
+_PERIOD_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text=PERIOD_LABELS["one_time"])],
+        [KeyboardButton(text=PERIOD_LABELS["daily"])],
+        [KeyboardButton(text=PERIOD_LABELS["weekly"])],
+        [KeyboardButton(text=PERIOD_LABELS["biweekly"])],
+        [KeyboardButton(text=PERIOD_LABELS["monthly"])],
+        [KeyboardButton(text=PERIOD_LABELS["quarterly"])],
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
 
 
 def period_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text=PERIOD_LABELS["one_time"])],
-            [KeyboardButton(text=PERIOD_LABELS["daily"])],
-            [KeyboardButton(text=PERIOD_LABELS["weekly"])],
-            [KeyboardButton(text=PERIOD_LABELS["biweekly"])],
-            [KeyboardButton(text=PERIOD_LABELS["monthly"])],
-            [KeyboardButton(text=PERIOD_LABELS["quarterly"])],
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _PERIOD_KB
+
+
+_EDIT_FIELD_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="Текст")],
+        [KeyboardButton(text="Дата")],
+        [KeyboardButton(text="Периодичность")],
+        [KeyboardButton(text="Группа")],
+        [KeyboardButton(text="Удалить")],
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
 
 
 def edit_field_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="Текст")],
-            [KeyboardButton(text="Дата")],
-            [KeyboardButton(text="Периодичность")],
-            [KeyboardButton(text="Группа")],
-            [KeyboardButton(text="Удалить")],
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _EDIT_FIELD_KB
+
+
+_SAVE_KB = ReplyKeyboardMarkup(
+    keyboard=[
+        [
+            KeyboardButton(text="Сохранить"),
+            KeyboardButton(text="Отмена"),
+        ]
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
 
 
 def save_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text="Сохранить"),
-                KeyboardButton(text="Отмена"),
-            ]
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _SAVE_KB
+
+
+_DELETE_KB = ReplyKeyboardMarkup(
+    keyboard=[[KeyboardButton(text="Удалить"), KeyboardButton(text="Отмена")]],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
 
 
 def delete_keyboard() -> ReplyKeyboardMarkup:
-    return ReplyKeyboardMarkup(
-        keyboard=[[KeyboardButton(text="Удалить"), KeyboardButton(text="Отмена")]],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
+    return _DELETE_KB
 
 
 def edit_number_keyboard(count: int) -> ReplyKeyboardMarkup:
@@ -119,12 +136,15 @@ def edit_number_keyboard(count: int) -> ReplyKeyboardMarkup:
     )
 
 
+_EDIT_INLINE_KB = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="Редактировать", callback_data="edit_reminders")]
+    ]
+)
+
+
 def edit_inline_keyboard() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="Редактировать", callback_data="edit_reminders")]
-        ]
-    )
+    return _EDIT_INLINE_KB
 
 
 def parse_datetime(text: str, tz: ZoneInfo) -> Optional[datetime]:
@@ -145,9 +165,10 @@ def normalize_chat_ref(text: str) -> Optional[str]:
         value = value.split("t.me/")[-1]
     if value.startswith("+") or value.startswith("c/"):
         return None
-    if re.fullmatch(r"-?\d+", value):
+    digits = value.removeprefix("-")
+    if digits.isascii() and digits.isdigit():
         return value
-    if re.fullmatch(r"[A-Za-z0-9_]{4,}", value):
+    if len(value) >= 4 and _USERNAME_CHARS.issuperset(value):
         return f"@{value}"
     return None
 
@@ -204,7 +225,7 @@ async def add_text(message: Message, state: FSMContext) -> None:
 
 
 async def add_date(message: Message, state: FSMContext) -> None:
-    tz = ZoneInfo(config.TIMEZONE)
+    tz = config.TZ
     parsed = parse_datetime(message.text or "", tz)
     if not parsed:
         await message.answer("Неверный формат. Попробуйте еще раз.")
@@ -215,7 +236,7 @@ async def add_date(message: Message, state: FSMContext) -> None:
 
 
 async def add_period(message: Message, state: FSMContext) -> None:
-    period = LABEL_TO_PERIOD.get(message.text or "")
+    period = LABEL_TO_PERIOD.get((message.text or "").strip())
     if not period:
         await message.answer("Выберите период из списка.")
         return
@@ -239,11 +260,12 @@ async def add_chat(
         )
         return
     data = await state.get_data()
-    tz = ZoneInfo(config.TIMEZONE)
+    tz = config.TZ
     next_run = reminder_scheduler.normalize_next_run(
         data["date"], data["period"], now=datetime.now(tz)
     )
-    reminder_id = storage.add_reminder(
+    reminder = await asyncio.to_thread(
+        storage.add_reminder,
         config.DB_PATH,
         message.from_user.id,
         data["text"],
@@ -251,11 +273,9 @@ async def add_chat(
         data["period"],
         chat_ref,
     )
-    reminder = storage.get_reminder(config.DB_PATH, reminder_id)
-    if reminder:
-        reminder_scheduler.schedule_reminder(
-            scheduler, reminder, bot, config.DB_PATH, config.TIMEZONE
-        )
+    reminder_scheduler.schedule_reminder(
+        scheduler, reminder, bot, config.DB_PATH, config.TZ
+    )
     await state.clear()
     await message.answer(
         "Напоминание создано.",
@@ -267,19 +287,22 @@ async def list_reminders(message: Message, state: FSMContext) -> None:
     if message.chat.type != ChatType.PRIVATE:
         return
     await state.clear()
-    reminders = list(
-        storage.list_active_reminders(config.DB_PATH, message.from_user.id)
+    reminders = await asyncio.to_thread(
+        list, storage.list_active_reminders(config.DB_PATH, message.from_user.id)
     )
     if not reminders:
         await message.answer("Активных напоминаний нет.", reply_markup=main_keyboard())
         return
     lines = []
     ids = []
-    tz = ZoneInfo(config.TIMEZONE)
+    tz = config.TZ
+    fmt = config.DATE_FORMAT
+    labels = PERIOD_LABELS
     for idx, reminder in enumerate(reminders, start=1):
-        next_run = reminder.next_run.astimezone(tz).strftime(config.DATE_FORMAT)
+        next_run = reminder.next_run.astimezone(tz).strftime(fmt)
+        label = labels.get(reminder.period)
         lines.append(
-            f"{idx}) {reminder.text} | {next_run} | {PERIOD_LABELS.get(reminder.period)} | {reminder.chat_ref}"
+            f"{idx}) {reminder.text} | {next_run} | {label} | {reminder.chat_ref}"
         )
         ids.append(reminder.id)
     await state.update_data(list_ids=ids)
@@ -358,9 +381,9 @@ async def edit_choose_field(message: Message, state: FSMContext) -> None:
 async def edit_enter_value(message: Message, state: FSMContext) -> None:
     data = await state.get_data()
     field = data.get("edit_field")
-    tz = ZoneInfo(config.TIMEZONE)
+    tz = config.TZ
     if field == "period":
-        period = LABEL_TO_PERIOD.get(message.text or "")
+        period = LABEL_TO_PERIOD.get((message.text or "").strip())
         if not period:
             await message.answer("Выберите период из списка.")
             return
@@ -392,16 +415,17 @@ async def edit_confirm(
     bot: Bot,
     scheduler,
 ) -> None:
+    data = await state.get_data()
     if (message.text or "").strip() == "Отмена":
         await state.clear()
         await message.answer("Изменения отменены.", reply_markup=main_keyboard())
         return
-    data = await state.get_data()
     if (message.text or "").strip() == "Удалить":
-        data = await state.get_data()
         reminder_id = data.get("reminder_id")
         if reminder_id:
-            storage.deactivate_reminder(config.DB_PATH, reminder_id)
+            await asyncio.to_thread(
+                storage.deactivate_reminder, config.DB_PATH, reminder_id
+            )
             reminder_scheduler.unschedule_reminder(scheduler, reminder_id)
         await state.clear()
         await message.answer("Напоминание удалено.", reply_markup=main_keyboard())
@@ -412,9 +436,10 @@ async def edit_confirm(
     if (message.text or "").strip() != "Сохранить":
         await message.answer("Нажмите «Сохранить» или «Отмена».")
         return
-    data = await state.get_data()
     reminder_id = data["reminder_id"]
-    reminder = storage.get_reminder(config.DB_PATH, reminder_id)
+    reminder = await asyncio.to_thread(
+        storage.get_reminder, config.DB_PATH, reminder_id
+    )
     if not reminder:
         await state.clear()
         await message.answer("Напоминание не найдено.", reply_markup=main_keyboard())
@@ -422,7 +447,7 @@ async def edit_confirm(
 
     field = data["edit_field"]
     new_value = data["new_value"]
-    tz = ZoneInfo(config.TIMEZONE)
+    tz = config.TZ
 
     update_kwargs = {}
     if field == "text":
@@ -442,13 +467,13 @@ async def edit_confirm(
         update_kwargs["period"] = new_value
         update_kwargs["next_run"] = next_run
 
-    storage.update_reminder(config.DB_PATH, reminder_id, **update_kwargs)
+    await asyncio.to_thread(
+        storage.update_reminder, config.DB_PATH, reminder_id, **update_kwargs
+    )
     reminder_scheduler.unschedule_reminder(scheduler, reminder_id)
-    refreshed = storage.get_reminder(config.DB_PATH, reminder_id)
-    if refreshed:
-        reminder_scheduler.schedule_reminder(
-            scheduler, refreshed, bot, config.DB_PATH, config.TIMEZONE
-        )
+    reminder_scheduler.schedule_reminder(
+        scheduler, replace(reminder, **update_kwargs), bot, config.DB_PATH, config.TZ
+    )
 
     await state.clear()
     await message.answer("Изменения сохранены.", reply_markup=main_keyboard())
@@ -472,6 +497,17 @@ def setup_routes(router: Router) -> None:
     router.message.register(edit_confirm, EditReminder.confirm)
 
 
+def restore_reminders(scheduler, bot: Bot, reminders: list) -> None:
+    scheduler.pause()
+    try:
+        for reminder in reminders:
+            reminder_scheduler.schedule_reminder(
+                scheduler, reminder, bot, config.DB_PATH, config.TZ
+            )
+    finally:
+        scheduler.resume()
+
+
 async def main() -> None:
     if not config.BOT_TOKEN:
         raise RuntimeError("REMINDER_BOT_TOKEN is required")
@@ -483,15 +519,19 @@ async def main() -> None:
     setup_routes(router)
     dp.include_router(router)
 
-    scheduler = reminder_scheduler.build_scheduler(config.TIMEZONE)
+    scheduler = reminder_scheduler.build_scheduler(config.TZ)
     scheduler.start()
     dp["scheduler"] = scheduler
-    for reminder in storage.list_all_active_reminders(config.DB_PATH):
-        reminder_scheduler.schedule_reminder(
-            scheduler, reminder, bot, config.DB_PATH, config.TIMEZONE
-        )
 
-    await dp.start_polling(bot)
+    try:
+        reminders = await asyncio.to_thread(
+            list, storage.list_all_active_reminders(config.DB_PATH)
+        )
+        restore_reminders(scheduler, bot, reminders)
+        await dp.start_polling(bot)
+    finally:
+        scheduler.shutdown(wait=False)
+        storage.close_db()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from dateutil.relativedelta import relativedelta
 from zoneinfo import ZoneInfo
 
@@ -26,12 +30,13 @@ def compute_next_run(base_time: datetime, period: str, *, now: datetime) -> date
     if delta is None:
         raise ValueError(f"Unknown period: {period}")
 
-    next_time = base_time
+    next_time = base_time.astimezone(now.tzinfo)
+    if isinstance(delta, timedelta):
+        if next_time <= now:
+            next_time = next_time + delta * ((now - next_time) // delta + 1)
+        return next_time
     while next_time <= now:
-        if isinstance(delta, relativedelta):
-            next_time = next_time + delta
-        else:
-            next_time = next_time + delta
+        next_time = next_time + delta
     return next_time
 
 
@@ -43,8 +48,36 @@ def normalize_next_run(start_time: datetime, period: str, *, now: datetime) -> d
     return compute_next_run(start_time, period, now=now)
 
 
-def build_scheduler(timezone: str) -> AsyncIOScheduler:
-    return AsyncIOScheduler(timezone=ZoneInfo(timezone))
+class CalendarTrigger(BaseTrigger):
+    def __init__(self, delta: relativedelta, start_date: datetime) -> None:
+        self.delta = delta
+        self.start_date = start_date
+
+    def get_next_fire_time(
+        self, previous_fire_time: Optional[datetime], now: datetime
+    ) -> Optional[datetime]:
+        if previous_fire_time is None:
+            return self.start_date
+        return previous_fire_time + self.delta
+
+    def __repr__(self) -> str:
+        return f"<CalendarTrigger (delta={self.delta!r}, start_date={self.start_date!r})>"
+
+
+def _build_trigger(reminder: Reminder, tz: ZoneInfo) -> BaseTrigger:
+    start_date = reminder.next_run.astimezone(tz)
+    delta = PERIODS.get(reminder.period)
+    if delta is None:
+        return DateTrigger(run_date=start_date, timezone=tz)
+    if isinstance(delta, relativedelta):
+        return CalendarTrigger(delta, start_date)
+    return IntervalTrigger(
+        seconds=delta.total_seconds(), start_date=start_date, timezone=tz
+    )
+
+
+def build_scheduler(tz: ZoneInfo) -> AsyncIOScheduler:
+    return AsyncIOScheduler(timezone=tz)
 
 
 def _job_id(reminder_id: int) -> str:
@@ -62,16 +95,14 @@ def schedule_reminder(
     reminder: Reminder,
     bot,
     db_path: str,
-    timezone: str,
+    tz: ZoneInfo,
 ) -> None:
     job_id = _job_id(reminder.id)
-    run_date = reminder.next_run
     scheduler.add_job(
         send_reminder,
-        "date",
+        _build_trigger(reminder, tz),
         id=job_id,
-        run_date=run_date,
-        args=[reminder.id, bot, db_path, timezone, scheduler],
+        args=[reminder.id, bot, db_path, tz],
         replace_existing=True,
     )
 
@@ -80,24 +111,32 @@ async def send_reminder(
     reminder_id: int,
     bot,
     db_path: str,
-    timezone: str,
-    scheduler: AsyncIOScheduler,
+    tz: ZoneInfo,
 ) -> None:
-    reminder = storage.get_reminder(db_path, reminder_id)
+    reminder = await asyncio.to_thread(storage.get_reminder, db_path, reminder_id)
     if not reminder or reminder.status != "active":
         return
 
+    last_sent_at = None
     try:
         await bot.send_message(reminder.chat_ref, reminder.text)
-        now = datetime.now(ZoneInfo(timezone))
-        storage.update_reminder(db_path, reminder_id, last_sent_at=now)
+        last_sent_at = datetime.now(tz)
     except Exception:
-        now = datetime.now(ZoneInfo(timezone))
+        pass
+    now = last_sent_at or datetime.now(tz)
     if reminder.period == "one_time":
-        storage.deactivate_reminder(db_path, reminder_id)
+        await asyncio.to_thread(
+            storage.deactivate_reminder,
+            db_path,
+            reminder_id,
+            last_sent_at=last_sent_at,
+        )
         return
     next_run = compute_next_run(reminder.next_run, reminder.period, now=now)
-    storage.update_reminder(db_path, reminder_id, next_run=next_run)
-    refreshed = storage.get_reminder(db_path, reminder_id)
-    if refreshed:
-        schedule_reminder(scheduler, refreshed, bot, db_path, timezone)
+    await asyncio.to_thread(
+        storage.update_reminder,
+        db_path,
+        reminder_id,
+        next_run=next_run,
+        last_sent_at=last_sent_at,
+    )
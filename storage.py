@@ -1,7 +1,8 @@
 import os
 import sqlite3
-from datetime import datetime
-from typing import Iterable, Optional
+import threading
+from datetime import datetime, timezone
+from typing import Iterator, Optional
 
 from models import Reminder
 
@@ -12,13 +13,76 @@ def _ensure_db_dir(db_path: str) -> None:
         os.makedirs(directory, exist_ok=True)
 
 
+_CONN: dict[str, sqlite3.Connection] = {}
+_LOCK = threading.RLock()
+_FETCH_BATCH = 64
+
+SQL_INSERT_REMINDER = """
+    INSERT INTO reminders (
+        owner_user_id, text, next_run, period, chat_ref, status, created_at, updated_at,
+        next_run_ts, created_at_ts, updated_at_ts
+    )
+    VALUES (?, ?, ?, ?, ?, 'active', ?, ?, ?, ?, ?)
+"""
+SQL_REMINDER_COLUMNS = """
+    id, owner_user_id, text, period, chat_ref, status,
+    next_run_ts AS "next_run [epoch]",
+    created_at_ts AS "created_at [epoch]",
+    updated_at_ts AS "updated_at [epoch]",
+    last_sent_at_ts AS "last_sent_at [epoch]"
+"""
+SQL_LIST_ACTIVE_REMINDERS = f"""
+    SELECT {SQL_REMINDER_COLUMNS} FROM reminders
+    WHERE status = 'active'
+      AND owner_user_id = ?
+    ORDER BY next_run_ts ASC, id ASC
+"""
+SQL_LIST_ALL_ACTIVE_REMINDERS = f"""
+    SELECT {SQL_REMINDER_COLUMNS} FROM reminders
+    WHERE status = 'active'
+    ORDER BY next_run_ts ASC, id ASC
+"""
+SQL_GET_REMINDER = f"SELECT {SQL_REMINDER_COLUMNS} FROM reminders WHERE id = ?"
+SQL_UPDATE_TEMPLATE = "UPDATE reminders SET {fields} WHERE id = ?"
+SQL_DEACTIVATE_REMINDER = """
+    UPDATE reminders
+    SET status = 'inactive', updated_at = ?, updated_at_ts = ?,
+        last_sent_at = COALESCE(?, last_sent_at),
+        last_sent_at_ts = COALESCE(?, last_sent_at_ts)
+    WHERE id = ?
+"""
+
+
 def _connect(db_path: str) -> sqlite3.Connection:
-    _ensure_db_dir(db_path)
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        cached_statements=256,
+        detect_types=sqlite3.PARSE_COLNAMES,
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     return conn
 
 
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    with _LOCK:
+        conn = _CONN.get(db_path)
+        if conn is None:
+            conn = _connect(db_path)
+            _CONN[db_path] = conn
+        return conn
+
+
+def close_db() -> None:
+    with _LOCK:
+        for conn in _CONN.values():
+            conn.close()
+        _CONN.clear()
+
+
 def _ensure_owner_column(conn: sqlite3.Connection) -> None:
     columns = conn.execute("PRAGMA table_info(reminders)").fetchall()
     column_names = {row["name"] for row in columns}
@@ -28,8 +92,52 @@ def _ensure_owner_column(conn: sqlite3.Connection) -> None:
         )
 
 
+_TIMESTAMP_COLUMNS = ("next_run", "created_at", "updated_at", "last_sent_at")
+
+
+def _to_ts(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _from_ts(value: bytes) -> datetime:
+    return datetime.fromtimestamp(int(value), tz=timezone.utc)
+
+
+sqlite3.register_converter("epoch", _from_ts)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _ensure_timestamp_columns(conn: sqlite3.Connection) -> None:
+    columns = conn.execute("PRAGMA table_info(reminders)").fetchall()
+    column_names = {row["name"] for row in columns}
+    for name in _TIMESTAMP_COLUMNS:
+        if f"{name}_ts" not in column_names:
+            conn.execute(f"ALTER TABLE reminders ADD COLUMN {name}_ts INTEGER")
+    pending = " OR ".join(
+        f"({name} IS NOT NULL AND {name}_ts IS NULL)" for name in _TIMESTAMP_COLUMNS
+    )
+    assignments = ", ".join(f"{name}_ts = ?" for name in _TIMESTAMP_COLUMNS)
+    rows = conn.execute(
+        f"SELECT id, {', '.join(_TIMESTAMP_COLUMNS)} FROM reminders WHERE {pending}"
+    ).fetchall()
+    for row in rows:
+        params = [
+            _to_ts(datetime.fromisoformat(row[name])) if row[name] else None
+            for name in _TIMESTAMP_COLUMNS
+        ]
+        params.append(row["id"])
+        conn.execute(f"UPDATE reminders SET {assignments} WHERE id = ?", params)
+
+
 def init_db(db_path: str) -> None:
-    with _connect(db_path) as conn:
+    _ensure_db_dir(db_path)
+    with _LOCK:
+        conn = _get_conn(db_path)
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS reminders (
@@ -42,11 +150,30 @@ def init_db(db_path: str) -> None:
                 status TEXT NOT NULL DEFAULT 'active',
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
-                last_sent_at TEXT
+                last_sent_at TEXT,
+                next_run_ts INTEGER NOT NULL,
+                created_at_ts INTEGER NOT NULL,
+                updated_at_ts INTEGER NOT NULL,
+                last_sent_at_ts INTEGER
             )
             """
         )
         _ensure_owner_column(conn)
+        _ensure_timestamp_columns(conn)
+        conn.execute("DROP INDEX IF EXISTS idx_reminders_active")
+        conn.execute("DROP INDEX IF EXISTS idx_reminders_owner_active")
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_reminders_active_ts
+            ON reminders(status, next_run_ts, id)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_reminders_owner_active_ts
+            ON reminders(owner_user_id, status, next_run_ts, id)
+            """
+        )
         conn.commit()
 
 
@@ -55,15 +182,13 @@ def _row_to_reminder(row: sqlite3.Row) -> Reminder:
         id=row["id"],
         owner_user_id=row["owner_user_id"],
         text=row["text"],
-        next_run=datetime.fromisoformat(row["next_run"]),
+        next_run=row["next_run"],
         period=row["period"],
         chat_ref=row["chat_ref"],
         status=row["status"],
-        created_at=datetime.fromisoformat(row["created_at"]),
-        updated_at=datetime.fromisoformat(row["updated_at"]),
-        last_sent_at=datetime.fromisoformat(row["last_sent_at"])
-        if row["last_sent_at"]
-        else None,
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        last_sent_at=row["last_sent_at"],
     )
 
 
@@ -74,52 +199,98 @@ def add_reminder(
     next_run: datetime,
     period: str,
     chat_ref: str,
-) -> int:
-    now = datetime.utcnow().isoformat()
-    with _connect(db_path) as conn:
+) -> Reminder:
+    now = _utcnow()
+    now_iso = now.isoformat()
+    now_ts = _to_ts(now)
+    with _LOCK:
+        conn = _get_conn(db_path)
         cursor = conn.execute(
-            """
-            INSERT INTO reminders (owner_user_id, text, next_run, period, chat_ref, status, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, 'active', ?, ?)
-            """,
-            (owner_user_id, text, next_run.isoformat(), period, chat_ref, now, now),
+            SQL_INSERT_REMINDER,
+            (
+                owner_user_id,
+                text,
+                next_run.isoformat(),
+                period,
+                chat_ref,
+                now_iso,
+                now_iso,
+                _to_ts(next_run),
+                now_ts,
+                now_ts,
+            ),
         )
         conn.commit()
-        return int(cursor.lastrowid)
+        reminder_id = int(cursor.lastrowid)
+    stored_now = _from_ts(now_ts)
+    return Reminder(
+        id=reminder_id,
+        owner_user_id=owner_user_id,
+        text=text,
+        next_run=_from_ts(_to_ts(next_run)),
+        period=period,
+        chat_ref=chat_ref,
+        status="active",
+        created_at=stored_now,
+        updated_at=stored_now,
+        last_sent_at=None,
+    )
 
 
-def list_active_reminders(db_path: str, owner_user_id: int) -> Iterable[Reminder]:
-    with _connect(db_path) as conn:
-        rows = conn.execute(
-            """
-            SELECT * FROM reminders
-            WHERE status = 'active'
-              AND owner_user_id = ?
-            ORDER BY next_run ASC, id ASC
-            """,
-            (owner_user_id,),
-        ).fetchall()
-        return [_row_to_reminder(row) for row in rows]
-
-
-def list_all_active_reminders(db_path: str) -> Iterable[Reminder]:
-    with _connect(db_path) as conn:
-        rows = conn.execute(
-            """
-            SELECT * FROM reminders
-            WHERE status = 'active'
-            ORDER BY next_run ASC, id ASC
-            """
-        ).fetchall()
-        return [_row_to_reminder(row) for row in rows]
+def add_reminders(
+    db_path: str,
+    items: list[tuple[int, str, datetime, str, str]],
+) -> None:
+    now = _utcnow()
+    now_iso = now.isoformat()
+    now_ts = _to_ts(now)
+    rows = [
+        (
+            owner_user_id,
+            text,
+            next_run.isoformat(),
+            period,
+            chat_ref,
+            now_iso,
+            now_iso,
+            _to_ts(next_run),
+            now_ts,
+            now_ts,
+        )
+        for owner_user_id, text, next_run, period, chat_ref in items
+    ]
+    with _LOCK:
+        conn = _get_conn(db_path)
+        conn.executemany(SQL_INSERT_REMINDER, rows)
+        conn.commit()
+
+
+def _iter_reminders(db_path: str, sql: str, params: tuple = ()) -> Iterator[Reminder]:
+    with _LOCK:
+        cursor = _get_conn(db_path).execute(sql, params)
+    try:
+        while True:
+            with _LOCK:
+                rows = cursor.fetchmany(_FETCH_BATCH)
+            if not rows:
+                return
+            yield from (_row_to_reminder(row) for row in rows)
+    finally:
+        cursor.close()
+
+
+def list_active_reminders(db_path: str, owner_user_id: int) -> Iterator[Reminder]:
+    yield from _iter_reminders(db_path, SQL_LIST_ACTIVE_REMINDERS, (owner_user_id,))
+
+
+def list_all_active_reminders(db_path: str) -> Iterator[Reminder]:
+    yield from _iter_reminders(db_path, SQL_LIST_ALL_ACTIVE_REMINDERS)
 
 
 def get_reminder(db_path: str, reminder_id: int) -> Optional[Reminder]:
-    with _connect(db_path) as conn:
-        row = conn.execute(
-            "SELECT * FROM reminders WHERE id = ?",
-            (reminder_id,),
-        ).fetchone()
+    with _LOCK:
+        conn = _get_conn(db_path)
+        row = conn.execute(SQL_GET_REMINDER, (reminder_id,)).fetchone()
         return _row_to_reminder(row) if row else None
 
 
@@ -139,8 +310,9 @@ def update_reminder(
         fields.append("text = ?")
         params.append(text)
     if next_run is not None:
-        fields.append("next_run = ?")
+        fields.append("next_run = ?, next_run_ts = ?")
         params.append(next_run.isoformat())
+        params.append(_to_ts(next_run))
     if period is not None:
         fields.append("period = ?")
         params.append(period)
@@ -148,30 +320,43 @@ def update_reminder(
         fields.append("chat_ref = ?")
         params.append(chat_ref)
     if last_sent_at is not None:
-        fields.append("last_sent_at = ?")
+        fields.append("last_sent_at = ?, last_sent_at_ts = ?")
         params.append(last_sent_at.isoformat())
+        params.append(_to_ts(last_sent_at))
     if not fields:
         return
-    fields.append("updated_at = ?")
-    params.append(datetime.utcnow().isoformat())
+    now = _utcnow()
+    fields.append("updated_at = ?, updated_at_ts = ?")
+    params.append(now.isoformat())
+    params.append(_to_ts(now))
     params.append(reminder_id)
 
-    with _connect(db_path) as conn:
+    with _LOCK:
+        conn = _get_conn(db_path)
         conn.execute(
-            f"UPDATE reminders SET {', '.join(fields)} WHERE id = ?",
+            SQL_UPDATE_TEMPLATE.format(fields=", ".join(fields)),
             params,
         )
         conn.commit()
 
 
-def deactivate_reminder(db_path: str, reminder_id: int) -> None:
-    with _connect(db_path) as conn:
+def deactivate_reminder(
+    db_path: str,
+    reminder_id: int,
+    *,
+    last_sent_at: Optional[datetime] = None,
+) -> None:
+    now = _utcnow()
+    with _LOCK:
+        conn = _get_conn(db_path)
         conn.execute(
-            """
-            UPDATE reminders
-            SET status = 'inactive', updated_at = ?
-            WHERE id = ?
-            """,
-            (datetime.utcnow().isoformat(), reminder_id),
+            SQL_DEACTIVATE_REMINDER,
+            (
+                now.isoformat(),
+                _to_ts(now),
+                last_sent_at.isoformat() if last_sent_at else None,
+                _to_ts(last_sent_at) if last_sent_at else None,
+                reminder_id,
+            ),
         )
         conn.commit()